@@ -77,6 +77,7 @@ DEFAULT_CRYPTO = "ADA"
 DEFAULT_PORT = 10000
 LOG_INTERVAL = 1  # seconds
 FILE_ROTATION_HOURS = 8  # hours
+CSV_FLUSH_INTERVAL = 5  # seconds of CSV rows buffered in memory before writing
 
 def get_crypto_config(crypto_symbol):
     """Get configuration for a specific cryptocurrency"""
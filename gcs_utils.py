@@ -1,7 +1,9 @@
 import os
 import datetime
+import gzip
 import mimetypes
 import json
+import threading
 from typing import Optional, List, Tuple
 
 try:
@@ -14,6 +16,10 @@ except Exception:  # pragma: no cover
 
 GCS_DEBUG = os.environ.get("GCS_DEBUG", "false").lower() == "true"
 
+# One client (and its pooled HTTP connections) per (bucket, project), shared across threads
+_bucket_cache = {}
+_bucket_lock = threading.Lock()
+
 
 def _debug(msg: str):
     if GCS_DEBUG:
@@ -84,9 +90,14 @@ def get_bucket():
 
     bucket_name = os.environ["GCS_BUCKET"]
     project = os.environ.get("GCP_PROJECT")
-    client = _build_storage_client(project=project)
-    _debug(f"Created storage client for project={project}, bucket={bucket_name}")
-    return client.bucket(bucket_name)
+    key = (bucket_name, project)
+    with _bucket_lock:
+        bucket = _bucket_cache.get(key)
+        if bucket is None:
+            client = _build_storage_client(project=project)
+            _debug(f"Created storage client for project={project}, bucket={bucket_name}")
+            bucket = _bucket_cache[key] = client.bucket(bucket_name)
+    return bucket
 
 
 def _normalize_blob_path(path: str) -> str:
@@ -99,8 +110,12 @@ def guess_content_type(path: str) -> str:
     return ctype or "application/octet-stream"
 
 
-def upload_file(local_path: str, blob_path: Optional[str] = None, *, content_type: Optional[str] = None, cache_control: Optional[str] = "no-cache") -> bool:
-    """Upload a local file to GCS. Returns True if uploaded, False if skipped."""
+def upload_file(local_path: str, blob_path: Optional[str] = None, *, content_type: Optional[str] = None, cache_control: Optional[str] = "no-cache", gzip_encode: bool = False) -> bool:
+    """Upload a local file to GCS. Returns True if uploaded, False if skipped.
+
+    With gzip_encode the object is stored gzip-compressed with Content-Encoding: gzip;
+    GCS still serves it decompressed to clients that do not accept gzip.
+    """
     if not is_gcs_enabled():
         _debug("Upload skipped: GCS not enabled")
         return False
@@ -116,17 +131,23 @@ def upload_file(local_path: str, blob_path: Optional[str] = None, *, content_typ
         content_type = guess_content_type(local_path)
 
     blob.cache_control = cache_control
-    _debug(f"Uploading {local_path} -> gs://{bucket.name}/{blob_name} (content_type={content_type})")
-    blob.upload_from_filename(local_path, content_type=content_type)
+    _debug(f"Uploading {local_path} -> gs://{bucket.name}/{blob_name} (content_type={content_type}, gzip={gzip_encode})")
+    if gzip_encode:
+        with open(local_path, "rb") as f:
+            data = gzip.compress(f.read(), compresslevel=6, mtime=0)
+        blob.content_encoding = "gzip"
+        blob.upload_from_string(data, content_type=content_type)
+    else:
+        blob.upload_from_filename(local_path, content_type=content_type)
     _debug("Upload complete")
     return True
 
 
-def upload_if_exists(local_path: str, blob_path: Optional[str] = None, *, content_type: Optional[str] = None) -> bool:
+def upload_if_exists(local_path: str, blob_path: Optional[str] = None, *, content_type: Optional[str] = None, gzip_encode: bool = False) -> bool:
     if not os.path.exists(local_path):
         _debug(f"upload_if_exists: local file missing: {local_path}")
         return False
-    return upload_file(local_path, blob_path, content_type=content_type)
+    return upload_file(local_path, blob_path, content_type=content_type, gzip_encode=gzip_encode)
 
 
 def download_file(blob_path: str, local_path: Optional[str] = None) -> bool:
@@ -216,18 +237,20 @@ def rsync_csvs_from_gcs(prefix: str, local_dir: str) -> Tuple[int, int]:
     os.makedirs(local_dir, exist_ok=True)
     downloaded = 0
     skipped = 0
-    for blob_name in list_blobs_with_prefix(prefix):
-        if not blob_name.lower().endswith('.csv'):
+    normalized = _normalize_blob_path(prefix)
+    # Listed blobs are known to exist, so download them directly instead of
+    # paying an exists() round-trip per file in download_file()
+    for blob in get_bucket().list_blobs(prefix=normalized):
+        if not blob.name.lower().endswith('.csv'):
             continue
         # Compute local target relative to the prefix root
-        rel_path = blob_name[len(_normalize_blob_path(prefix)):].lstrip('/')
+        rel_path = blob.name[len(normalized):].lstrip('/')
         local_path = os.path.join(local_dir, rel_path)
         if os.path.exists(local_path) and os.path.getsize(local_path) > 0:
             skipped += 1
             continue
         os.makedirs(os.path.dirname(local_path), exist_ok=True)
-        if download_file(blob_name, local_path):
-            downloaded += 1
-        else:
-            skipped += 1
+        _debug(f"Downloading gs://{blob.bucket.name}/{blob.name} -> {local_path}")
+        blob.download_to_filename(local_path)
+        downloaded += 1
     return (downloaded, skipped)
\ No newline at end of file
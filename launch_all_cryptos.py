@@ -3,47 +3,44 @@
 Multi-Cryptocurrency Logger Launcher
 ====================================
 
-This script launches multiple cryptocurrency loggers simultaneously,
-each running on its own port for parallel data collection.
+This script launches multiple cryptocurrency loggers simultaneously
+inside a single multi-asset server process, with each crypto routed
+by path (/<SYMBOL>/recent.json, ...) on one shared port.
 """
 
 import os
 import sys
-import time
 import signal
 import subprocess
-from concurrent.futures import ThreadPoolExecutor
-from config import get_available_cryptos, get_crypto_config
+from config import get_available_cryptos, get_crypto_config, DEFAULT_PORT
 
 class MultiCryptoLauncher:
-    def __init__(self):
+    def __init__(self, port=None):
         self.processes = {}
         self.running = True
+        self.port = port or int(os.environ.get("PORT", DEFAULT_PORT))
         
-    def launch_crypto_logger(self, crypto_symbol):
-        """Launch a single cryptocurrency logger"""
+    def launch_server(self, cryptos):
+        """Launch one multi-asset server process serving all given cryptos"""
         try:
-            config = get_crypto_config(crypto_symbol)
-            port = config["port"]
-            
-            print(f"🚀 Starting {crypto_symbol} logger on port {port}...")
+            print(f"🚀 Starting multi-asset server on port {self.port}...")
             
             # Start the process
             process = subprocess.Popen([
-                sys.executable, "multi_crypto_logger.py", crypto_symbol
-            ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+                sys.executable, "multi_asset_server.py", *cryptos
+            ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1,
+               env={**os.environ, "PORT": str(self.port)})
             
-            self.processes[crypto_symbol] = process
+            self.processes["server"] = process
             
             # Monitor the process output
             while self.running and process.poll() is None:
                 output = process.stdout.readline()
                 if output:
-                    print(f"[{crypto_symbol}] {output.strip()}")
-                time.sleep(0.1)
+                    print(f"[server] {output.strip()}")
                     
         except Exception as e:
-            print(f"❌ Error launching {crypto_symbol}: {e}")
+            print(f"❌ Error launching multi-asset server: {e}")
     
     def launch_all(self, cryptos=None):
         """Launch all cryptocurrency loggers"""
@@ -55,40 +52,31 @@ class MultiCryptoLauncher:
         print(f"📊 Launching loggers for: {', '.join(cryptos)}")
         print("=" * 50)
         
-        # Display port assignments
+        # Display route assignments
         for crypto in cryptos:
             config = get_crypto_config(crypto)
-            print(f"• {crypto}: http://localhost:{config['port']} -> {config['pair']}")
+            print(f"• {crypto}: http://localhost:{self.port}/{crypto}/ -> {config['pair']}")
         
         print("\n🚀 Starting all loggers...")
         
-        # Launch all in parallel
-        with ThreadPoolExecutor(max_workers=len(cryptos)) as executor:
-            futures = []
-            for crypto in cryptos:
-                future = executor.submit(self.launch_crypto_logger, crypto)
-                futures.append(future)
-            
-            try:
-                # Wait for all to complete (or until interrupted)
-                for future in futures:
-                    future.result()
-            except KeyboardInterrupt:
-                self.shutdown()
+        try:
+            self.launch_server(cryptos)
+        except KeyboardInterrupt:
+            self.shutdown()
     
     def shutdown(self):
         """Shutdown all processes"""
         print("\n🛑 Shutting down all cryptocurrency loggers...")
         self.running = False
         
-        for crypto, process in self.processes.items():
+        for name, process in self.processes.items():
             if process.poll() is None:
-                print(f"⏹️ Stopping {crypto} logger...")
+                print(f"⏹️ Stopping {name}...")
                 process.terminate()
                 try:
                     process.wait(timeout=5)
                 except subprocess.TimeoutExpired:
-                    print(f"⚠️ Force killing {crypto} logger...")
+                    print(f"⚠️ Force killing {name}...")
                     process.kill()
         
         print("✅ All loggers stopped")
@@ -97,12 +85,11 @@ class MultiCryptoLauncher:
         """Check status of all processes"""
         print("\n📊 Cryptocurrency Logger Status:")
         print("-" * 40)
-        for crypto, process in self.processes.items():
+        for name, process in self.processes.items():
             if process.poll() is None:
-                config = get_crypto_config(crypto)
-                print(f"✅ {crypto}: Running on port {config['port']}")
+                print(f"✅ {name}: Running on port {self.port}")
             else:
-                print(f"❌ {crypto}: Stopped")
+                print(f"❌ {name}: Stopped")
 
 def launch_specific_cryptos():
     """Launch specific cryptocurrencies based on command line arguments"""
@@ -130,15 +117,15 @@ def show_usage():
     print("\nAvailable cryptocurrencies:")
     for crypto in available:
         config = get_crypto_config(crypto)
-        print(f"  • {crypto}: {config['pair']} (port {config['port']})")
+        print(f"  • {crypto}: {config['pair']}")
     
-    print("\nEach cryptocurrency will run on its own port:")
+    port = int(os.environ.get("PORT", DEFAULT_PORT))
+    print(f"\nAll cryptocurrencies are served by one process on port {port}:")
     for crypto in available:
-        config = get_crypto_config(crypto)
-        print(f"  • {crypto}: http://localhost:{config['port']}")
+        print(f"  • {crypto}: http://localhost:{port}/{crypto}/recent.json")
     
     print("\n💡 Tips:")
-    print("  • Each crypto logger runs independently")
+    print("  • Set PORT to change the shared server port")
     print("  • Data is stored in separate folders per crypto")
     print("  • All loggers can run simultaneously")
     print("  • Use Ctrl+C to stop all loggers")
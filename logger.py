@@ -97,7 +97,7 @@ def log_data():
             print(f"[{data['timestamp']}] ✅ Logged to {filename}")
 
             # Run comprehensive JSON generation with full historical context
-            process_csv_to_json()
+            process_csv_to_json(throttle_historical=True)
             
             # Best-effort CSV upload for durability
             try:
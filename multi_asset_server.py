@@ -3,18 +3,22 @@
 from flask import Flask, jsonify, send_file, send_from_directory, abort
 from flask_cors import CORS
 import os
-import threading
-import time
+import sys
 from datetime import datetime, UTC
 
 from config import get_available_cryptos, get_crypto_config, DEFAULT_CRYPTO
-from multi_crypto_logger import CryptoLogger
+from multi_crypto_logger import CryptoLogger, OrderbookPoller, install_shutdown_handlers
 import glob
-import shutil
 
 # Registry of running loggers per symbol
 symbol_to_logger = {}
 
+# Single poll loop that fetches every registered symbol's orderbook each second
+poller = OrderbookPoller()
+
+# Symbols served by this process (all configured cryptos unless run_app narrows it)
+enabled_symbols = set(get_available_cryptos())
+
 app = Flask(__name__)
 CORS(app)
 
@@ -97,10 +101,12 @@ def start_logger_for_symbol(crypto_symbol: str) -> CryptoLogger:
         import gcs_utils  # type: ignore
         sync_on_start = os.environ.get("GCS_SYNC_ON_START", "true").lower() == "true"
         if gcs_utils.is_gcs_enabled() and sync_on_start:
-            # Hydrate CSVs and any prior JSONs
+            # Hydrate CSVs; prior JSONs are only worth fetching when there are
+            # no CSVs, since the rebuild below overwrites them
             _hydrate_csvs_and_json(logger)
-            gcs_utils.download_if_exists(recent_file, recent_file)
-            gcs_utils.download_if_exists(historical_file, historical_file)
+            if not glob.glob(os.path.join(logger.data_folder, "*.csv")):
+                gcs_utils.download_if_exists(recent_file, recent_file)
+                gcs_utils.download_if_exists(historical_file, historical_file)
     except Exception:
         pass
 
@@ -116,10 +122,10 @@ def start_logger_for_symbol(crypto_symbol: str) -> CryptoLogger:
     except Exception as e:
         print(f"⚠️ Initial JSON rebuild error: {e}")
 
-    # Start continuous logging with timed JSON generation
-    t = threading.Thread(target=logger.log_data_continuous, daemon=True)
-    t.start()
-    print(f"✅ Started {crypto_symbol} logger thread with timed JSON updates")
+    # Join the shared poll loop (timed JSON generation runs off the poll thread)
+    poller.add(logger)
+    poller.start()
+    print(f"✅ Registered {crypto_symbol} with the shared orderbook poller")
 
     return logger
 
@@ -127,9 +133,8 @@ def start_logger_for_symbol(crypto_symbol: str) -> CryptoLogger:
 def ensure_logger(symbol: str) -> CryptoLogger:
     symbol = symbol.upper()
     if symbol not in symbol_to_logger:
-        # Only start if symbol is configured
-        available = get_available_cryptos()
-        if symbol not in available:
+        # Only start if symbol is configured and served by this process
+        if symbol not in enabled_symbols:
             raise KeyError(f"Unknown cryptocurrency: {symbol}")
         symbol_to_logger[symbol] = start_logger_for_symbol(symbol)
     return symbol_to_logger[symbol]
@@ -137,7 +142,7 @@ def ensure_logger(symbol: str) -> CryptoLogger:
 
 @app.route("/")
 def home():
-    available = get_available_cryptos()
+    available = [s for s in get_available_cryptos() if s in enabled_symbols]
     base = {
         "status": "✅ Multi-Asset Crypto Logger is running",
         "timestamp": datetime.now(UTC).isoformat(),
@@ -181,6 +186,7 @@ def status(symbol):
 def get_current_csv(symbol):
     try:
         logger = ensure_logger(symbol)
+        logger._flush()
         filename = os.path.join(logger.data_folder, logger.get_current_csv_filename())
         if os.path.exists(filename):
             return send_file(filename, as_attachment=False)
@@ -207,6 +213,7 @@ def list_csvs(symbol):
 def download_csv(symbol, filename):
     try:
         logger = ensure_logger(symbol)
+        logger._flush()
         return send_from_directory(logger.data_folder, filename)
     except KeyError:
         return jsonify({"error": f"Unknown cryptocurrency: {symbol}"}), 404
@@ -293,6 +300,8 @@ def serve_index_default():
 def all_status():
     statuses = {}
     for symbol in get_available_cryptos():
+        if symbol not in enabled_symbols:
+            continue
         try:
             logger = ensure_logger(symbol)
             statuses[symbol] = {
@@ -326,12 +335,13 @@ def gcs_self_test():
 
         test_blob_path = os.path.join("render_app", "data", "gcs-self-test.txt")
         uploaded = gcs_utils.upload_if_exists(test_local_path, test_blob_path, content_type="text/plain")
+        blob_path = test_blob_path.replace("\\", "/")
 
         return jsonify({
             "ok": uploaded,
             "bucket": bucket,
-            "blob_path": test_blob_path.replace("\\", "/"),
-            "gs_url": f"gs://{bucket}/{test_blob_path.replace('\\', '/')}"
+            "blob_path": blob_path,
+            "gs_url": f"gs://{bucket}/{blob_path}"
         }), (200 if uploaded else 500)
     except Exception as e:
         return jsonify({
@@ -340,19 +350,26 @@ def gcs_self_test():
         }), 500
 
 
-def run_app():
-    # Start all configured cryptos
-    for symbol in get_available_cryptos():
+def run_app(symbols=None, port=None):
+    """Serve every crypto from this one Flask process, routed by /<SYMBOL>/..."""
+    if symbols:
+        enabled_symbols.intersection_update(s.upper() for s in symbols)
+    served = [s for s in get_available_cryptos() if s in enabled_symbols]
+    install_shutdown_handlers()
+
+    # Start all served cryptos
+    for symbol in served:
         try:
             ensure_logger(symbol)
         except Exception as e:
             print(f"❌ Failed to start logger for {symbol}: {e}")
 
     # Run single Flask app
-    port = int(os.environ.get("PORT", 10000))
-    print(f"🚀 Starting multi-asset server on port {port} for: {', '.join(get_available_cryptos())}")
+    if port is None:
+        port = int(os.environ.get("PORT", 10000))
+    print(f"🚀 Starting multi-asset server on port {port} for: {', '.join(served)}")
     app.run(host="0.0.0.0", port=port, debug=False)
 
 
 if __name__ == "__main__":
-    run_app()
\ No newline at end of file
+    run_app([arg.upper() for arg in sys.argv[1:]] or None)
\ No newline at end of file
@@ -4,15 +4,76 @@
 from flask_cors import CORS
 from flask import Flask, jsonify, send_file, send_from_directory, abort, request
 import requests
-import csv
 import time
 import os
 import threading
+import asyncio
+import atexit
+import signal
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, UTC
-from config import get_crypto_config, get_available_cryptos, get_crypto_from_port
+from config import get_crypto_config, get_available_cryptos, get_crypto_from_port, LOG_INTERVAL, CSV_FLUSH_INTERVAL, FILE_ROTATION_HOURS
 import sys
 import glob
 import shutil
+import logging
+
+# Optional: HTTP/2 client so one connection can carry every crypto's request
+try:
+    import httpx  # type: ignore
+    import h2  # type: ignore  # noqa: F401  (httpx's http2=True needs it)
+    _HAS_H2 = True
+except Exception:
+    httpx = None
+    _HAS_H2 = False
+
+# Only this module's logger is configured: a root basicConfig would also surface
+# httpx's per-request INFO lines (one per crypto per second)
+log = logging.getLogger("crypto_logger")
+if not log.handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    log.addHandler(_log_handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+# CSV layout written by every logger. Values are numeric or ISO/pair strings,
+# so no field ever needs csv quoting.
+CSV_FIELDS = (
+    "timestamp", "asset", "exchange", "price", "bid", "ask",
+    "spread", "volume", "spread_avg_L5", "spread_avg_L5_pct",
+)
+CSV_HEADER = ",".join(CSV_FIELDS) + "\r\n"
+_CSV_TEXT_FIELDS = ("timestamp", "asset", "exchange")
+
+# One keep-alive connection pool shared by every logger in the process
+_http_session = requests.Session()
+
+# Every logger created in this process, so buffered rows can be flushed on exit
+_live_loggers = weakref.WeakSet()
+
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+
+def _write_rows(fd, rows):
+    """Write buffered rows to fd, using one writev() per batch where available"""
+    if not hasattr(os, "writev"):
+        pending = b"".join(rows)
+        while pending:
+            pending = pending[os.write(fd, pending):]
+        return
+    for i in range(0, len(rows), _IOV_MAX):
+        batch = rows[i:i + _IOV_MAX]
+        written = os.writev(fd, batch)
+        if written < sum(map(len, batch)):
+            # Short write: finish the remainder the slow way
+            pending = b"".join(batch)[written:]
+            while pending:
+                pending = pending[os.write(fd, pending):]
 
 class CryptoLogger:
     """Individual cryptocurrency logger"""
@@ -23,90 +84,159 @@ class CryptoLogger:
         self.last_logged = {"timestamp": None}
         self.data_folder = self.config["data_folder"]
         self.last_json_update = {"recent": time.time(), "historical": time.time()}  # Track last JSON updates
+        # Precompiled row template; floats use repr (same text as csv.writer)
+        self._row_fmt = ",".join(
+            f"{{{name}}}" if name in _CSV_TEXT_FIELDS else f"{{{name}!r}}" for name in CSV_FIELDS
+        ) + "\r\n"
+        # Rows are buffered and written to a persistent append handle every
+        # CSV_FLUSH_INTERVAL seconds; readers call _flush() first
+        self._buf = []  # encoded rows, written with writev on flush
+        self._fh = None
+        self._fh_path = None
+        self._last_flush = time.time()
+        self._io_lock = threading.Lock()
+        self._csv_name = None
+        self._csv_name_expiry = 0.0  # epoch seconds at which the current block ends
         os.makedirs(self.data_folder, exist_ok=True)
+        _live_loggers.add(self)
         
     def get_current_csv_filename(self):
-        """Generate CSV filename with 8-hour rotation"""
-        now = datetime.now(UTC)
-        hour_block = (now.hour // 8) * 8
+        """Generate CSV filename with 8-hour rotation (recomputed only when the block ends)"""
+        now = time.time()
+        if now < self._csv_name_expiry:
+            return self._csv_name
+        dt = datetime.fromtimestamp(now, UTC)
+        hour_block = (dt.hour // FILE_ROTATION_HOURS) * FILE_ROTATION_HOURS
         block_label = f"{hour_block:02d}"
-        date_str = now.strftime("%Y-%m-%d")
-        return f"{date_str}_{block_label}.csv"
+        date_str = dt.strftime("%Y-%m-%d")
+        self._csv_name = f"{date_str}_{block_label}.csv"
+        block_start = dt.replace(hour=hour_block, minute=0, second=0, microsecond=0)
+        self._csv_name_expiry = block_start.timestamp() + FILE_ROTATION_HOURS * 3600
+        return self._csv_name
     
+    def request_orderbook(self):
+        """GET the raw level-2 orderbook JSON from the exchange API"""
+        response = _http_session.get(self.config["api_url"], timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def parse_orderbook(self, data):
+        """Turn a raw orderbook payload into one CSV row"""
+        bids = data.get("bids", [])
+        asks = data.get("asks", [])
+
+        if not bids or not asks:
+            raise ValueError("Empty orderbook data")
+
+        best_bid = float(bids[0][0])
+        best_ask = float(asks[0][0])
+        mid_price = (best_bid + best_ask) / 2
+        spread = best_ask - best_bid
+
+        # L5 average spread calculation (top 5 orderbook levels)
+        top_bids = [float(b[0]) for b in bids[:5]]
+        top_asks = [float(a[0]) for a in asks[:5]]
+        if len(top_bids) < 5 or len(top_asks) < 5:
+            spread_avg_L5 = spread
+            spread_avg_L5_pct = (spread / mid_price) * 100
+        else:
+            bid_avg = sum(top_bids) / 5
+            ask_avg = sum(top_asks) / 5
+            spread_avg_L5 = ask_avg - bid_avg
+            spread_avg_L5_pct = (spread_avg_L5 / mid_price) * 100
+
+        volume = sum(float(b[1]) for b in bids[:5]) + sum(float(a[1]) for a in asks[:5])
+        
+        return {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "asset": self.config["pair"],
+            "exchange": self.config["exchange"],
+            "price": mid_price,
+            "bid": best_bid,
+            "ask": best_ask,
+            "spread": spread,
+            "volume": volume,
+            "spread_avg_L5": spread_avg_L5,
+            "spread_avg_L5_pct": spread_avg_L5_pct
+        }
+
     def fetch_orderbook(self):
         """Fetch orderbook data from API"""
         try:
-            response = requests.get(self.config["api_url"], timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            bids = data.get("bids", [])
-            asks = data.get("asks", [])
-
-            if not bids or not asks:
-                raise ValueError("Empty orderbook data")
-
-            best_bid = float(bids[0][0])
-            best_ask = float(asks[0][0])
-            mid_price = (best_bid + best_ask) / 2
-            spread = best_ask - best_bid
-
-            # L5 average spread calculation (top 5 orderbook levels)
-            top_bids = [float(b[0]) for b in bids[:5]]
-            top_asks = [float(a[0]) for a in asks[:5]]
-            if len(top_bids) < 5 or len(top_asks) < 5:
-                spread_avg_L5 = spread
-                spread_avg_L5_pct = (spread / mid_price) * 100
-            else:
-                bid_avg = sum(top_bids) / 5
-                ask_avg = sum(top_asks) / 5
-                spread_avg_L5 = ask_avg - bid_avg
-                spread_avg_L5_pct = (spread_avg_L5 / mid_price) * 100
-
-            volume = sum(float(b[1]) for b in bids[:5]) + sum(float(a[1]) for a in asks[:5])
-            
-            return {
-                "timestamp": datetime.now(UTC).isoformat(),
-                "asset": self.config["pair"],
-                "exchange": self.config["exchange"],
-                "price": mid_price,
-                "bid": best_bid,
-                "ask": best_ask,
-                "spread": spread,
-                "volume": volume,
-                "spread_avg_L5": spread_avg_L5,
-                "spread_avg_L5_pct": spread_avg_L5_pct
-            }
+            return self.parse_orderbook(self.request_orderbook())
         except Exception as e:
-            print(f"❌ Error fetching {self.crypto_symbol} data: {e}")
+            log.error("❌ Error fetching %s data: %s", self.crypto_symbol, e)
             return None
 
     def log_data_once(self):
         """Log data once"""
+        data = self.fetch_orderbook()
+        if data is None:
+            return False
+        return self._write_row(data)
+
+    def _ingest(self, book):
+        """Log a row from an orderbook payload fetched elsewhere (see OrderbookPoller)"""
+        try:
+            data = self.parse_orderbook(book)
+        except Exception as e:
+            log.error("❌ Error fetching %s data: %s", self.crypto_symbol, e)
+            return False
+        return self._write_row(data)
+
+    def _write_row(self, data):
         try:
-            data = self.fetch_orderbook()
-            if data is None:
-                return False
-                
             filename = os.path.join(self.data_folder, self.get_current_csv_filename())
-            file_exists = os.path.isfile(filename)
 
-            with open(filename, "a", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=data.keys())
-                if not file_exists:
-                    writer.writeheader()
-                writer.writerow(data)
+            with self._io_lock:
+                if filename != self._fh_path:
+                    # 8-hour block rotated (or first row): drain into the old file first
+                    self._flush_locked()
+                    self._open_locked(filename)
+                self._buf.append(self._row_fmt.format_map(data).encode())
+                if time.time() - self._last_flush >= CSV_FLUSH_INTERVAL:
+                    self._flush_locked()
 
             self.last_logged["timestamp"] = data["timestamp"]
-            print(f"[{data['timestamp']}] ✅ {self.crypto_symbol} logged to {filename}")
+            log.debug("[%s] ✅ %s logged to %s", data["timestamp"], self.crypto_symbol, filename)
             
             # NO automatic JSON processing - use separate timer thread
             return True
             
         except Exception as e:
-            print(f"🚨 Error logging {self.crypto_symbol}: {str(e)}")
+            log.error("🚨 Error logging %s: %s", self.crypto_symbol, e)
             return False
 
+    def _open_locked(self, filename):
+        if self._fh is not None:
+            self._fh.close()
+        file_exists = os.path.isfile(filename) and os.path.getsize(filename) > 0
+        # Unbuffered: rows go straight from our buffer to the fd
+        self._fh = open(filename, "ab", buffering=0)
+        self._fh_path = filename
+        if not file_exists:
+            _write_rows(self._fh.fileno(), [CSV_HEADER.encode()])
+
+    def _flush_locked(self):
+        if self._buf and self._fh is not None:
+            _write_rows(self._fh.fileno(), self._buf)
+            self._buf.clear()
+        self._last_flush = time.time()
+
+    def _flush(self):
+        """Write buffered CSV rows to disk"""
+        with self._io_lock:
+            self._flush_locked()
+
+    def close(self):
+        """Flush buffered rows and close the CSV file handle"""
+        with self._io_lock:
+            self._flush_locked()
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+                self._fh_path = None
+
     def check_and_process_json(self):
         """Check if JSON files need updating based on proper intervals"""
         current_time = time.time()
@@ -116,32 +246,36 @@ class CryptoLogger:
         historical_file = os.path.join(self.data_folder, "historical.json")
         
         if not os.path.exists(recent_file):
-            print(f"🔄 Force generating missing recent.json for {self.crypto_symbol}")
+            log.info("🔄 Force generating missing recent.json for %s", self.crypto_symbol)
             self.process_recent_json()
             self.last_json_update["recent"] = current_time
             return  # Exit early to avoid double processing
             
         if not os.path.exists(historical_file):
-            print(f"🔄 Force generating missing historical.json for {self.crypto_symbol}")
+            log.info("🔄 Force generating missing historical.json for %s", self.crypto_symbol)
             self.process_historical_json()
             self.last_json_update["historical"] = current_time
             return  # Exit early to avoid double processing
         
         # Recent JSON: Update every 60 seconds (1 minute) - STRICT TIMING
         if current_time - self.last_json_update["recent"] >= 60:
-            print(f"📊 Updating recent.json for {self.crypto_symbol} (60 second interval)")
-            self.process_recent_json()
+            log.info("📊 Updating recent.json for %s (60 second interval)", self.crypto_symbol)
+            self.process_recent_json(throttle_historical=True)
             self.last_json_update["recent"] = current_time
             
         # Historical JSON: Update every 3600 seconds (1 hour) - STRICT TIMING
         if current_time - self.last_json_update["historical"] >= 3600:
-            print(f"🏛️ Updating historical.json for {self.crypto_symbol} (1 hour interval)")
+            log.info("🏛️ Updating historical.json for %s (1 hour interval)", self.crypto_symbol)
             self.process_historical_json()
             self.last_json_update["historical"] = current_time
 
-    def process_recent_json(self):
-        """Generate recent.json file"""
+    def process_recent_json(self, throttle_historical=False):
+        """Generate recent.json file (periodic ticks pass throttle_historical=True
+        so the same run rewrites historical.json at most every few minutes)"""
         try:
+            # JSON is built from the CSVs on disk
+            self._flush()
+
             # Import here to avoid circular imports
             import sys
             import os
@@ -151,7 +285,7 @@ class CryptoLogger:
             
             # Process atomically for this asset/folder
             if hasattr(process_data, 'process_csv_to_json_atomic'):
-                process_data.process_csv_to_json_atomic(self.data_folder, self.config.get('pair'))
+                process_data.process_csv_to_json_atomic(self.data_folder, self.config.get('pair'), throttle_historical)
             else:
                 # Fallback (older versions)
                 original_folder = getattr(process_data, 'DATA_FOLDER', None)
@@ -168,14 +302,17 @@ class CryptoLogger:
                         delattr(process_data, 'EXPECTED_ASSET_PAIR')
                     except Exception:
                         process_data.EXPECTED_ASSET_PAIR = None
-            print(f"📊 Updated recent.json for {self.crypto_symbol}")
+            log.info("📊 Updated recent.json for %s", self.crypto_symbol)
                 
         except Exception as e:
-            print(f"❌ Error updating recent JSON for {self.crypto_symbol}: {e}")
+            log.error("❌ Error updating recent JSON for %s: %s", self.crypto_symbol, e)
 
     def process_historical_json(self):
         """Generate historical.json file"""
         try:
+            # JSON is built from the CSVs on disk
+            self._flush()
+
             # Import here to avoid circular imports
             import sys
             import os
@@ -201,10 +338,37 @@ class CryptoLogger:
                         delattr(process_data, 'EXPECTED_ASSET_PAIR')
                     except Exception:
                         process_data.EXPECTED_ASSET_PAIR = None
-            print(f"🏛️ Updated historical.json for {self.crypto_symbol}")
+            log.info("🏛️ Updated historical.json for %s", self.crypto_symbol)
                 
         except Exception as e:
-            print(f"❌ Error updating historical JSON for {self.crypto_symbol}: {e}")
+            log.error("❌ Error updating historical JSON for %s: %s", self.crypto_symbol, e)
+
+    def run_timed_json(self, tick):
+        """JSON rebuilds and CSV upload due on this tick of the 1-second logging loop"""
+        # Update recent.json every 1 minute (60 seconds)
+        if tick % 60 == 0:
+            log.info("📊 1-minute interval - updating recent.json for %s", self.crypto_symbol)
+            try:
+                self.process_recent_json(throttle_historical=True)
+            except Exception as e:
+                log.error("❌ Error updating recent.json: %s", e)
+            
+            # Best-effort: upload current CSV to GCS for durability
+            try:
+                from gcs_utils import is_gcs_enabled, upload_if_exists
+                if is_gcs_enabled():
+                    current_csv = os.path.join(self.data_folder, self.get_current_csv_filename())
+                    upload_if_exists(current_csv, current_csv, content_type="text/csv")
+            except Exception as _:
+                pass
+        
+        # Update historical.json every 10 minutes (600 seconds) 
+        if tick % 600 == 0:
+            log.info("🏛️ 10-minute interval - updating historical.json for %s", self.crypto_symbol)
+            try:
+                self.process_historical_json()
+            except Exception as e:
+                log.error("❌ Error updating historical.json: %s", e)
 
     def log_data_continuous(self):
         """Continuous logging loop with proper JSON timing"""
@@ -215,37 +379,126 @@ class CryptoLogger:
             self.log_data_once()
             
             json_counter += 1
-            
-            # Update recent.json every 1 minute (60 seconds)
-            if json_counter % 60 == 0:
-                print(f"📊 1-minute interval - updating recent.json for {self.crypto_symbol}")
-                try:
-                    self.process_recent_json()
-                except Exception as e:
-                    print(f"❌ Error updating recent.json: {e}")
-                
-                # Best-effort: upload current CSV to GCS for durability
-                try:
-                    from gcs_utils import is_gcs_enabled, upload_if_exists
-                    if is_gcs_enabled():
-                        current_csv = os.path.join(self.data_folder, self.get_current_csv_filename())
-                        upload_if_exists(current_csv, current_csv, content_type="text/csv")
-                except Exception as _:
-                    pass
-            
-            # Update historical.json every 10 minutes (600 seconds) 
+            self.run_timed_json(json_counter)
             if json_counter % 600 == 0:
-                print(f"🏛️ 10-minute interval - updating historical.json for {self.crypto_symbol}")
-                try:
-                    self.process_historical_json()
-                except Exception as e:
-                    print(f"❌ Error updating historical.json: {e}")
                 json_counter = 0  # Reset to prevent overflow
             
             elapsed = time.time() - start_time
-            sleep_time = max(0, 1.0 - elapsed)
+            sleep_time = max(0, LOG_INTERVAL - elapsed)
             time.sleep(sleep_time)
 
+
+def flush_all_loggers():
+    """Flush and close the CSV handles of every logger in this process"""
+    for logger in list(_live_loggers):
+        try:
+            logger.close()
+        except Exception as e:
+            log.warning("⚠️ Error flushing %s CSV: %s", logger.crypto_symbol, e)
+
+
+def install_shutdown_handlers():
+    """Flush buffered CSV rows on SIGTERM (platform restarts) and interpreter exit"""
+    def _on_sigterm(signum, frame):
+        log.info("🛑 SIGTERM received - flushing CSV buffers")
+        flush_all_loggers()
+        os._exit(0)
+
+    atexit.register(flush_all_loggers)
+    signal.signal(signal.SIGTERM, _on_sigterm)
+
+
+class OrderbookPoller:
+    """One loop that fetches the orderbooks of all registered loggers together.
+
+    With httpx + h2 installed every request of a tick is multiplexed over a
+    single HTTP/2 connection; otherwise the shared requests.Session pool is
+    used from a small thread pool. JSON rebuilds run on a separate worker so
+    a slow rebuild never delays the next tick.
+    """
+
+    def __init__(self):
+        self.loggers = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._json_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="json")
+        self._json_pending = {}
+
+    def add(self, logger):
+        with self._lock:
+            self.loggers.append(logger)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _snapshot(self):
+        with self._lock:
+            return list(self.loggers)
+
+    def _run(self):
+        if httpx is not None and _HAS_H2:
+            log.info("🔗 Orderbook poller using one HTTP/2 connection for all cryptos")
+            asyncio.run(self._run_async())
+        else:
+            self._run_threaded()
+
+    async def _run_async(self):
+        limits = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+        async with httpx.AsyncClient(http2=True, timeout=10, limits=limits) as client:
+            tick = 0
+            while True:
+                start_time = time.time()
+                loggers = self._snapshot()
+                responses = await asyncio.gather(
+                    *(client.get(lg.config["api_url"]) for lg in loggers), return_exceptions=True
+                )
+                books = []
+                for logger, response in zip(loggers, responses):
+                    try:
+                        if isinstance(response, Exception):
+                            raise response
+                        response.raise_for_status()
+                        books.append(response.json())
+                    except Exception as e:
+                        log.error("❌ Error fetching %s data: %s", logger.crypto_symbol, e)
+                        books.append(None)
+                tick = self._dispatch(loggers, books, tick)
+                await asyncio.sleep(max(0, LOG_INTERVAL - (time.time() - start_time)))
+
+    def _run_threaded(self):
+        tick = 0
+        with ThreadPoolExecutor(max_workers=8, thread_name_prefix="orderbook") as fetch_pool:
+            while True:
+                start_time = time.time()
+                loggers = self._snapshot()
+                books = list(fetch_pool.map(self._request_or_none, loggers))
+                tick = self._dispatch(loggers, books, tick)
+                time.sleep(max(0, LOG_INTERVAL - (time.time() - start_time)))
+
+    @staticmethod
+    def _request_or_none(logger):
+        try:
+            return logger.request_orderbook()
+        except Exception as e:
+            log.error("❌ Error fetching %s data: %s", logger.crypto_symbol, e)
+            return None
+
+    def _dispatch(self, loggers, books, tick):
+        tick += 1
+        for logger, book in zip(loggers, books):
+            if book is not None:
+                logger._ingest(book)
+            if tick % 60 == 0:
+                # Skip this round if the logger's previous rebuild is still running
+                pending = self._json_pending.get(logger.crypto_symbol)
+                if pending is None or pending.done():
+                    self._json_pending[logger.crypto_symbol] = self._json_pool.submit(logger.run_timed_json, tick)
+        return 0 if tick % 600 == 0 else tick
+
+
 def _normalized_path(s: str) -> str:
     return s.replace("\\", "/").strip()
 
@@ -278,7 +531,7 @@ def _hydrate_from_gcs_and_rebuild(logger):
     try:
         import gcs_utils  # type: ignore
         if not gcs_utils.is_gcs_enabled():
-            print("☁️ GCS not enabled; skipping hydration")
+            log.info("☁️ GCS not enabled; skipping hydration")
         else:
             # Build candidate prefixes
             import_prefixes = []
@@ -312,27 +565,29 @@ def _hydrate_from_gcs_and_rebuild(logger):
                 d, s = gcs_utils.rsync_csvs_from_gcs(prefix, dest)
                 total_downloaded += d
                 total_skipped += s
-            print(f"☁️ Hydration {symbol}: prefixes={len(unique_prefixes)} downloaded={total_downloaded} skipped={total_skipped}")
-            # Warm JSONs if present in bucket
-            recent_file = os.path.join(logger.data_folder, "recent.json")
-            historical_file = os.path.join(logger.data_folder, "historical.json")
-            gcs_utils.download_if_exists(recent_file, recent_file)
-            gcs_utils.download_if_exists(historical_file, historical_file)
+            log.info("☁️ Hydration %s: prefixes=%s downloaded=%s skipped=%s", symbol, len(unique_prefixes), total_downloaded, total_skipped)
+            # Warm JSONs from the bucket only when there are no CSVs to rebuild
+            # them from; otherwise the rebuild below overwrites them right away
+            if not glob.glob(os.path.join(logger.data_folder, "*.csv")):
+                recent_file = os.path.join(logger.data_folder, "recent.json")
+                historical_file = os.path.join(logger.data_folder, "historical.json")
+                gcs_utils.download_if_exists(recent_file, recent_file)
+                gcs_utils.download_if_exists(historical_file, historical_file)
     except Exception as e:
-        print(f"⚠️ GCS hydration error ({symbol}): {e}")
+        log.warning("⚠️ GCS hydration error (%s): %s", symbol, e)
     # Local back-compat copy
     try:
         copied, skipped = _copy_root_csvs_into_symbol_folder(logger)
         if copied or skipped:
-            print(f"📁 Copied root CSVs into {symbol} folder: copied={copied} skipped={skipped}")
+            log.info("📁 Copied root CSVs into %s folder: copied=%s skipped=%s", symbol, copied, skipped)
     except Exception as e:
-        print(f"⚠️ Local CSV copy error ({symbol}): {e}")
+        log.warning("⚠️ Local CSV copy error (%s): %s", symbol, e)
     # Rebuild JSONs from all CSVs (merge-safe in process_data)
     try:
         logger.process_historical_json()
         logger.process_recent_json()
     except Exception as e:
-        print(f"⚠️ Initial JSON rebuild error ({symbol}): {e}")
+        log.warning("⚠️ Initial JSON rebuild error (%s): %s", symbol, e)
 
 
 def create_app(crypto_symbol):
@@ -351,7 +606,7 @@ def create_app(crypto_symbol):
         if sync_on_start:
             _hydrate_from_gcs_and_rebuild(logger)
     except Exception as e:
-        print(f"⚠️ Startup hydration skipped ({crypto_symbol}): {e}")
+        log.warning("⚠️ Startup hydration skipped (%s): %s", crypto_symbol, e)
     
     @app.route("/")
     def home():
@@ -391,6 +646,7 @@ def create_app(crypto_symbol):
 
     @app.route("/data.csv")
     def get_current_csv():
+        logger._flush()
         filename = os.path.join(logger.data_folder, logger.get_current_csv_filename())
         if os.path.exists(filename):
             return send_file(filename, as_attachment=False)
@@ -409,6 +665,7 @@ def create_app(crypto_symbol):
     @app.route("/csv/<filename>")
     def download_csv(filename):
         try:
+            logger._flush()
             return send_from_directory(logger.data_folder, filename)
         except FileNotFoundError:
             abort(404)
@@ -430,8 +687,8 @@ def create_app(crypto_symbol):
         """Serve last 24 hours of data for fast chart startup"""
         file_path = os.path.join(logger.data_folder, "recent.json")
         abs_path = os.path.abspath(file_path)
-        print(f"🔍 Looking for recent.json at: {abs_path}")
-        print(f"✅ File exists: {os.path.exists(abs_path)}")
+        log.debug("🔍 Looking for recent.json at: %s", abs_path)
+        log.debug("✅ File exists: %s", os.path.exists(abs_path))
         if os.path.exists(abs_path):
             return send_file(abs_path, mimetype='application/json')
         else:
@@ -442,10 +699,10 @@ def create_app(crypto_symbol):
         """Serve complete historical dataset for full TradingView-style charts"""
         file_path = os.path.join(logger.data_folder, "historical.json")
         abs_path = os.path.abspath(file_path)
-        print(f"🔍 Looking for historical.json at: {abs_path}")
-        print(f"📂 Current working directory: {os.getcwd()}")
-        print(f"📁 Data folder: {logger.data_folder}")
-        print(f"✅ File exists: {os.path.exists(abs_path)}")
+        log.debug("🔍 Looking for historical.json at: %s", abs_path)
+        log.debug("📂 Current working directory: %s", os.getcwd())
+        log.debug("📁 Data folder: %s", logger.data_folder)
+        log.debug("✅ File exists: %s", os.path.exists(abs_path))
         if os.path.exists(abs_path):
             return send_file(abs_path, mimetype='application/json')
         else:
@@ -473,7 +730,7 @@ def create_app(crypto_symbol):
     def generate_json_now():
         """Manually trigger JSON generation and reset timing (for fresh deployments)"""
         try:
-            print(f"🔧 Manual JSON generation triggered for {crypto_symbol}")
+            log.info("🔧 Manual JSON generation triggered for %s", crypto_symbol)
             
             # Reset timing to ensure fresh generation
             current_time = time.time()
@@ -526,23 +783,26 @@ def run_crypto_server(crypto_symbol, port=None):
     historical_file = os.path.join(logger.data_folder, "historical.json")
     
     if not os.path.exists(recent_file):
-        print(f"🔄 Creating initial recent.json for {crypto_symbol}")
+        log.info("🔄 Creating initial recent.json for %s", crypto_symbol)
         logger.process_recent_json()
         
     if not os.path.exists(historical_file):
-        print(f"🔄 Creating initial historical.json for {crypto_symbol}")
+        log.info("🔄 Creating initial historical.json for %s", crypto_symbol)
         logger.process_historical_json()
     
+    # Flush buffered CSV rows if the platform stops us
+    install_shutdown_handlers()
+    
     # Start logging thread
     logging_thread = threading.Thread(target=logger.log_data_continuous, daemon=True)
     logging_thread.start()
-    print(f"✅ Started {crypto_symbol} logger thread with timed JSON updates")
+    log.info("✅ Started %s logger thread with timed JSON updates", crypto_symbol)
     
-    print(f"🚀 Starting {crypto_symbol} server on port {port}")
+    log.info("🚀 Starting %s server on port %s", crypto_symbol, port)
     try:
         app.run(host="0.0.0.0", port=port, debug=False)
     except Exception as e:
-        print(f"❌ Error running {crypto_symbol} server: {e}")
+        log.error("❌ Error running %s server: %s", crypto_symbol, e)
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
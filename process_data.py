@@ -1,10 +1,15 @@
 import os
+import numpy as np
 import pandas as pd
 import json
 from datetime import datetime, timedelta, UTC
 import glob
+import time
 from typing import List, Dict, Any  # type: ignore
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from config import FILE_ROTATION_HOURS
 
 # Optional GCS sync for generated files
 try:
@@ -12,12 +17,66 @@ try:
 except Exception:
     gcs_utils = None
 
+# Optional fast JSON encoder (falls back to stdlib json)
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+# Optional Arrow CSV reader and parquet engine for the parsed-CSV cache
+# (falls back to the pandas C parser and re-reading CSVs)
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pa_compute  # type: ignore
+    import pyarrow.csv as pa_csv  # type: ignore
+    import pyarrow.parquet as pa_parquet  # type: ignore
+    _HAS_PYARROW = True
+except Exception:
+    _HAS_PYARROW = False
+
+def _env_int(name: str, default: int) -> int:
+    """Integer setting from the environment; default when unset, blank or not a number."""
+    try:
+        return int(os.environ.get(name, ""))
+    except ValueError:
+        return default
+
 DATA_FOLDER = "render_app/data"
 EXPECTED_ASSET_PAIR = None  # When set, filter rows to this asset (e.g., ADA-USD)
+DAILY_MANIFEST = ".daily_manifest.json"  # date -> [last raw timestamp, raw row count]
+CLOSED_CSV_AGE_SECONDS = FILE_ROTATION_HOURS * 3600  # CSV blocks rotate every FILE_ROTATION_HOURS; older files are immutable
+CLOSED_CSV_GRACE_SECONDS = 60  # Idle time after a block's window ends before it counts as closed
+# Parallel block reads per run (ThreadPoolExecutor's default sizing); override with env
+CSV_READ_WORKERS = _env_int("CSV_READ_WORKERS", min(32, (os.cpu_count() or 1) + 4))
+CSV_BATCH_FILES = 8  # Closed blocks summarized per batch; bounds raw rows held in memory
+MMAP_MIN_BYTES = 4 * 1024 * 1024  # Memory-map CSV blocks larger than this when parsing
+MINUTE_STATE = ".minute_state.parquet"  # 1-minute partials + row stats of closed CSV blocks
+# Periodic runs (throttle_historical=True) rewrite historical.json at most this often
+HISTORICAL_REFRESH_SECONDS = _env_int("HISTORICAL_REFRESH_SECONDS", 300)
+_STATE_VERSION = 1
 
 _PROCESS_JSON_LOCK = threading.Lock()
 
-def process_csv_to_json_atomic(data_folder: str, expected_asset_pair: str | None) -> None:
+# GCS uploads run off the generation path; each run waits for its own uploads
+GCS_UPLOAD_WORKERS = 8  # stays under the storage client's default HTTP pool of 10
+_gcs_pool = ThreadPoolExecutor(max_workers=GCS_UPLOAD_WORKERS, thread_name_prefix="gcs-upload")
+_pending_uploads: List[Any] = []
+
+# 1-minute bar aggregation shared by every chart output
+AGG_SPEC = {
+    'price': 'last',           # Use last price in the minute
+    'bid': 'last',             # Use last bid in the minute
+    'ask': 'last',             # Use last ask in the minute
+    'spread': 'mean',          # Average spread over the minute
+    'spread_avg_L5_pct': 'mean',  # Average L5 spread percentage
+    'volume': 'sum'            # Sum volume over the minute
+}
+
+# Only these CSV columns are parsed; anything else the logger writes is skipped
+SOURCE_COLUMNS = ('timestamp', 'asset', 'exchange', *AGG_SPEC)
+LABEL_COLUMNS = ('asset', 'exchange')  # same few strings on every row; held as categoricals
+
+def process_csv_to_json_atomic(data_folder: str, expected_asset_pair: str | None, throttle_historical: bool = False) -> None:
     """Thread-safe CSV->JSON generation for a specific folder/asset without global bleed."""
     global DATA_FOLDER, EXPECTED_ASSET_PAIR
     with _PROCESS_JSON_LOCK:
@@ -26,16 +85,17 @@ def process_csv_to_json_atomic(data_folder: str, expected_asset_pair: str | None
         try:
             DATA_FOLDER = data_folder
             EXPECTED_ASSET_PAIR = expected_asset_pair
-            process_csv_to_json()
+            process_csv_to_json(throttle_historical)
         finally:
             DATA_FOLDER = original_folder
             EXPECTED_ASSET_PAIR = original_asset
 
-def process_csv_to_json():
+def process_csv_to_json(throttle_historical: bool = False):
     """
     Process all CSV files in the data folder and generate JSON files for chart consumption.
     Creates:
-    - historical.json: Complete dataset
+    - historical.json: Complete dataset (with throttle_historical, at most every
+      HISTORICAL_REFRESH_SECONDS; periodic callers set it)
     - recent.json: Last 24 hours of data
     - metadata.json: Dataset metadata
     - index.json: Index of available data
@@ -54,250 +114,616 @@ def process_csv_to_json():
         
         print(f"📊 Processing {len(csv_files)} CSV files...")
         
-        # Read and combine all CSV data
-        all_dataframes = []
-        
-        for csv_file in csv_files:
-            try:
-                df = pd.read_csv(csv_file)
-                if not df.empty:
-                    # Filter to expected asset if configured and column is present
-                    try:
-                        if EXPECTED_ASSET_PAIR and 'asset' in df.columns:
-                            df = df[df['asset'] == EXPECTED_ASSET_PAIR]
-                            if df.empty:
-                                print(f"⏭️  Skip {csv_file}: no rows for {EXPECTED_ASSET_PAIR}")
-                                continue
-                    except Exception:
-                        pass
-                    # Ensure timestamp is datetime with proper ISO8601 parsing
-                    df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', utc=True)
-                    all_dataframes.append(df)
-                    print(f"✅ Loaded {csv_file}: {len(df)} records")
-            except Exception as e:
-                print(f"❌ Error loading {csv_file}: {e}")
-                continue
-        
-        if not all_dataframes:
+        # Closed blocks never change, so they are summarized once into the
+        # persisted minute state; each run reads only blocks not in it yet
+        state, state_files = _load_state(EXPECTED_ASSET_PAIR)
+        pending = [f for f in csv_files if os.path.basename(f) not in state_files]
+        new_closed = [f for f in pending if _is_closed(f)]
+        open_files = [f for f in pending if f not in new_closed]
+        if len(pending) < len(csv_files):
+            print(f"♻️ Reusing minute state for {len(csv_files) - len(pending)} closed CSV files")
+        
+        if new_closed:
+            # Signatures are taken before reading so a concurrent rewrite is caught next run
+            signatures = {os.path.basename(f): _file_signature(f) for f in new_closed}
+            # Summarize in batches: only one batch of raw rows is alive at a
+            # time, and the minute partials merge exactly across batch edges
+            for i in range(0, len(new_closed), CSV_BATCH_FILES):
+                closed_df = _read_blocks(new_closed[i:i + CSV_BATCH_FILES])
+                if closed_df is not None:
+                    state = _merge_summaries(state, _summarize(closed_df))
+                del closed_df
+            state_files.update(signatures)
+            _save_state(state, state_files, EXPECTED_ASSET_PAIR)
+        
+        summary = state
+        open_df = _read_blocks(open_files)
+        if open_df is not None:
+            summary = _merge_summaries(state, _summarize(open_df))
+        
+        if not summary['total_records']:
             print("❌ No valid data found in CSV files")
             return
         
-        # Combine all data
-        combined_df = pd.concat(all_dataframes, ignore_index=True)
-        combined_df = combined_df.sort_values('timestamp').reset_index(drop=True)
+        print(f"📈 Combined dataset: {summary['total_records']} total records")
+        
+        # Every chart output is a slice of the same 1-minute bars
+        resampled = _finalize_bars(summary['partials'])
         
-        print(f"📈 Combined dataset: {len(combined_df)} total records")
+        # One clock reading per run: the recent.json cutoff and every generated_at
+        now = datetime.now(UTC)
         
         # Generate different JSON outputs
-        _generate_historical_json(combined_df)
-        _generate_recent_json(combined_df)
-        _generate_daily_json_files(combined_df)
-        _generate_metadata(combined_df, csv_files)
-        _generate_index(csv_files)
+        _generate_historical_json(resampled, now, throttle_historical)
+        _generate_recent_json(resampled, now)
+        _generate_daily_json_files(resampled, summary['days'])
+        _generate_metadata(summary, csv_files, now.isoformat())
+        _generate_index(csv_files, now.isoformat())
         
         print("✅ JSON processing completed successfully!")
         
     except Exception as e:
         print(f"❌ Error in process_csv_to_json: {e}")
         raise
+    finally:
+        # Return only once this run's files are in GCS
+        _wait_for_uploads()
 
-def _load_json_list(path: str) -> List[Dict[str, Any]]:
-    if not os.path.exists(path):
-        return []
+def _read_blocks(csv_files: List[str]):
+    """Read and filter CSV blocks into one time-sorted DataFrame (None if no rows)."""
+    if not csv_files:
+        return None
+    # Read blocks in parallel (Arrow and file I/O release the GIL).
+    # map() keeps file order, so blocks still arrive sorted by time.
+    workers = max(1, min(CSV_READ_WORKERS, len(csv_files)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        blocks = pool.map(_load_block, csv_files, [EXPECTED_ASSET_PAIR] * len(csv_files))
+        all_blocks = [block for block in blocks if block is not None]
+    if not all_blocks:
+        return None
+    
+    # Block files are read in name (= time) order, so the concatenation is
+    # normally sorted already and the full sort can be skipped.
+    if _HAS_PYARROW:
+        # Zero-copy concat, then one conversion that frees each Arrow column as
+        # soon as it is converted, so raw rows are not held twice at peak
+        table = pa.concat_tables(all_blocks, promote_options='permissive')
+        del all_blocks
+        df = table.to_pandas(split_blocks=True, self_destruct=True, categories=list(LABEL_COLUMNS))
+        del table
+    else:
+        df = pd.concat(all_blocks, ignore_index=True)
+        for col in LABEL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+    if not df['timestamp'].is_monotonic_increasing:
+        df = df.sort_values('timestamp', kind='stable', ignore_index=True)
+    return df
+
+def _load_block(csv_file: str, asset_pair):
+    """Read one block and filter it to asset_pair. With pyarrow the block is an
+    Arrow table (converted to pandas once, after concatenation), otherwise a
+    DataFrame. Returns None for empty or unreadable files."""
     try:
-        with open(path, 'r') as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
-            return []
-    except Exception:
-        return []
-
-
-def _merge_by_key(lists: List[List[Dict[str, Any]]], key: str = "time") -> List[Dict[str, Any]]:
-    merged: Dict[str, Dict[str, Any]] = {}
-    for records in lists:
-        for rec in records:
-            k = rec.get(key)
-            if k is None:
-                continue
-            merged[k] = rec
+        block = _read_csv_table(csv_file) if _HAS_PYARROW else _read_csv_file(csv_file)
+        if not len(block):
+            return None
+        # Filter to expected asset if configured and column is present
+        try:
+            if asset_pair:
+                block = _select_asset(block, asset_pair)
+                if not len(block):
+                    print(f"⏭️  Skip {csv_file}: no rows for {asset_pair}")
+                    return None
+        except Exception:
+            pass
+        print(f"✅ Loaded {csv_file}: {len(block)} records")
+        return block
+    except Exception as e:
+        print(f"❌ Error loading {csv_file}: {e}")
+        return None
+
+def _read_csv_file(csv_file: str):
+    """Read one block CSV into a DataFrame with its timestamp column parsed."""
+    df = pd.read_csv(csv_file, usecols=lambda col: col in SOURCE_COLUMNS, dtype=_CSV_DTYPES)
+    df['timestamp'] = _parse_timestamps(df['timestamp'])
+    return df
+
+def _read_csv_table(csv_file: str):
+    """Read one block CSV into an Arrow table with a timestamp[us, UTC] column.
+
+    Closed blocks (not modified for CLOSED_CSV_AGE_SECONDS) are parsed once and
+    cached as a sibling .parquet file, which later runs read instead of the CSV.
+    """
+    parquet_path = os.path.splitext(csv_file)[0] + '.parquet'
+    # The cache carries its CSV's mtime; any other mtime means the block was
+    # rewritten since (e.g. by a GCS sync) and the cache is stale
+    csv_mtime_ns = os.stat(csv_file).st_mtime_ns
+    if os.path.exists(parquet_path) and os.stat(parquet_path).st_mtime_ns == csv_mtime_ns:
+        try:
+            return _normalize_timestamp(pa_parquet.read_table(parquet_path))
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable cache {parquet_path}: {e}")
+    
     try:
-        return sorted(merged.values(), key=lambda r: r.get(key, ""))
-    except Exception:
-        return list(merged.values())
+        # Arrow's multithreaded reader parses ISO timestamps while tokenizing.
+        # Large blocks are memory-mapped so pages feed the parser without a read() copy.
+        if os.path.getsize(csv_file) > MMAP_MIN_BYTES:
+            with pa.memory_map(csv_file, 'r') as source:
+                table = pa_csv.read_csv(source, convert_options=_ARROW_CONVERT_OPTIONS)
+        else:
+            table = pa_csv.read_csv(csv_file, convert_options=_ARROW_CONVERT_OPTIONS)
+        table = _normalize_timestamp(table)
+    except Exception as e:
+        print(f"⚠️ Arrow reader failed on {csv_file}, using pandas parser: {e}")
+        table = pa.Table.from_pandas(_read_csv_file(csv_file), preserve_index=False)
+        table = _normalize_timestamp(table)
+    
+    if _is_closed(csv_file):
+        try:
+            pa_parquet.write_table(table, parquet_path, compression='zstd')
+            os.utime(parquet_path, ns=(csv_mtime_ns, csv_mtime_ns))
+        except Exception as e:
+            print(f"⚠️ Could not cache {csv_file} as parquet: {e}")
+    return table
+
+# Value columns are always float64; typing them up front skips inference and keeps
+# an all-empty column from coming back as null/object
+_CSV_DTYPES = {col: 'float64' for col in AGG_SPEC}
+_ARROW_TIMESTAMP = pa.timestamp('us', tz='UTC') if _HAS_PYARROW else None
+# Files missing one of these columns fail here and are re-read by pandas below
+_ARROW_CONVERT_OPTIONS = pa_csv.ConvertOptions(
+    include_columns=list(SOURCE_COLUMNS),
+    column_types={col: pa.float64() for col in AGG_SPEC},
+) if _HAS_PYARROW else None
+
+def _normalize_timestamp(table):
+    """Give every block the same timestamp type so the tables concatenate."""
+    i = table.schema.get_field_index('timestamp')
+    col = table.column(i)
+    if col.type == _ARROW_TIMESTAMP:
+        return table
+    if pa.types.is_timestamp(col.type):
+        col = col.cast(_ARROW_TIMESTAMP)
+    else:
+        # Offsets Arrow could not infer: parse on the pandas side
+        col = pa.array(_parse_timestamps(col.to_pandas()), type=_ARROW_TIMESTAMP)
+    return table.set_column(i, 'timestamp', col)
+
+def _select_asset(block, asset: str):
+    """Keep only rows for asset; blocks without an asset column pass through."""
+    if isinstance(block, pd.DataFrame):
+        return block[block['asset'] == asset] if 'asset' in block.columns else block
+    if 'asset' not in block.column_names:
+        return block
+    return block.filter(pa_compute.equal(block['asset'], asset))
+
+def _parse_timestamps(col):
+    """Parse logger timestamps (datetime.isoformat() in UTC) to datetime64[UTC].
+
+    The logger always writes a '+00:00' offset, so the offset is stripped and
+    NumPy's fixed ISO parser handles the rest, with or without microseconds.
+    Anything else goes through pandas' general ISO8601 parser.
+    """
+    if col.str.endswith('+00:00').all():
+        naive = col.str.slice(0, -6).to_numpy().astype('datetime64[us]')
+        return pd.Series(naive, index=col.index, name=col.name).dt.tz_localize('UTC')
+    return pd.to_datetime(col, format='ISO8601', utc=True)
+
+def _read_json(path: str) -> Any:
+    """Parse a JSON file (orjson when available). Raises on missing or bad files."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
-def _generate_historical_json(df):
-    """Generate complete historical data JSON - RESAMPLED TO 1-MINUTE INTERVALS"""
+_MINUTE_NS = 60_000_000_000
+
+def _partial_columns():
+    """Column -> how to combine it when merging partials ('last' or 'sum')."""
+    columns = {'last_ts': 'max'}
+    for col, how in AGG_SPEC.items():
+        if how == 'mean':
+            columns[f'{col}_sum'] = 'sum'
+            columns[f'{col}_count'] = 'sum'
+        else:
+            columns[col] = how
+    return columns
+
+def _minute_partials(df):
+    """Per-minute partial aggregates of sorted raw rows: last values with the
+    minute's last timestamp (last_ts), and sums/counts for mean and sum columns.
+    Partials of disjoint row sets combine exactly with _merge_partials."""
+    values = df[list(AGG_SPEC)]
+    if values.isna().to_numpy().any() or not df['timestamp'].is_monotonic_increasing:
+        # pandas skips NaNs per column; keep its semantics for dirty data
+        spec = {'last_ts': ('timestamp', 'max')}
+        for col, how in AGG_SPEC.items():
+            if how == 'mean':
+                spec[f'{col}_sum'] = (col, 'sum')
+                spec[f'{col}_count'] = (col, 'count')
+            else:
+                spec[col] = (col, how)
+        return df.groupby(df['timestamp'].dt.floor('min')).agg(**spec)
+    
+    # Fused single pass over the sorted rows: find where each minute starts,
+    # then last/sum every column with fancy indexing and add.reduceat
+    timestamps = df['timestamp'].array
+    minutes = df['timestamp'].values.astype('datetime64[ns]').view('i8') // _MINUTE_NS
+    starts = np.flatnonzero(np.diff(minutes, prepend=minutes[0] - 1))
+    bounds = np.append(starts, len(minutes))
+    ends = bounds[1:] - 1
+    
+    partials = {'last_ts': timestamps[ends]}
+    for col, how in AGG_SPEC.items():
+        arr = values[col].to_numpy(dtype='float64')
+        if how == 'last':
+            partials[col] = arr[ends]
+        elif how == 'mean':
+            partials[f'{col}_sum'] = np.add.reduceat(arr, starts)
+            partials[f'{col}_count'] = np.diff(bounds)
+        else:  # sum
+            partials[col] = np.add.reduceat(arr, starts)
+    index = pd.DatetimeIndex(timestamps[starts], name='timestamp').floor('min')
+    return pd.DataFrame(partials, index=index)
+
+def _merge_partials(older, newer):
+    """Combine the minute partials of two disjoint row sets."""
+    if older is None or older.empty:
+        return newer
+    if newer is None or newer.empty:
+        return older
+    overlap = older.index.intersection(newer.index)
+    if overlap.empty:
+        merged = pd.concat([older, newer])
+        return merged if merged.index.is_monotonic_increasing else merged.sort_index(kind='stable')
+    
+    # Minutes present in both (rows of one minute split across CSV blocks):
+    # sums add up and last values come from whichever side saw the later row
+    both = pd.concat([older.loc[overlap], newer.loc[overlap]]).sort_values('last_ts', kind='stable')
+    joined = both.groupby(level=0).agg(_partial_columns())
+    merged = pd.concat([older.drop(overlap), newer.drop(overlap), joined])
+    return merged.sort_index(kind='stable')
+
+def _finalize_bars(partials):
+    """Turn minute partials into dense 1-minute bars. Minutes without rows are
+    kept as NaN bars (volume 0) so callers can choose between dropna and ffill."""
+    index = pd.date_range(partials.index[0], partials.index[-1], freq='min',
+                          name='timestamp', unit=partials.index.unit)
+    partials = partials.reindex(index)
+    bars = {}
+    for col, how in AGG_SPEC.items():
+        if how == 'last':
+            bars[col] = partials[col]
+        elif how == 'mean':
+            bars[col] = partials[f'{col}_sum'] / partials[f'{col}_count']
+        else:  # sum
+            bars[col] = partials[col].fillna(0.0)
+    return pd.DataFrame(bars, index=index)
+
+def _summarize(df):
+    """Mergeable summary of raw rows: minute partials plus the row stats that
+    metadata.json and the daily manifest need."""
+    return {
+        'partials': _minute_partials(df),
+        'total_records': len(df),
+        'start': df['timestamp'].min(),
+        'end': df['timestamp'].max(),
+        'assets': set(df['asset'].dropna().unique()) if 'asset' in df.columns else None,
+        'exchanges': set(df['exchange'].dropna().unique()) if 'exchange' in df.columns else None,
+        'days': _daily_source_signatures(df),
+    }
+
+def _empty_summary():
+    return {'partials': None, 'total_records': 0, 'start': None, 'end': None,
+            'assets': None, 'exchanges': None, 'days': {}}
+
+def _union(a, b):
+    if a is None and b is None:
+        return None
+    return set(a or ()) | set(b or ())
+
+def _merge_summaries(a, b):
+    """Combine the summaries of two disjoint row sets."""
+    if not a['total_records']:
+        return b
+    if not b['total_records']:
+        return a
+    days = dict(a['days'])
+    for day, (last, count) in b['days'].items():
+        if day in days:
+            last = max(days[day][0], last, key=pd.Timestamp)
+            count += days[day][1]
+        days[day] = [last, count]
+    return {
+        'partials': _merge_partials(a['partials'], b['partials']),
+        'total_records': a['total_records'] + b['total_records'],
+        'start': min(a['start'], b['start']),
+        'end': max(a['end'], b['end']),
+        'assets': _union(a['assets'], b['assets']),
+        'exchanges': _union(a['exchanges'], b['exchanges']),
+        'days': days,
+    }
+
+def _is_closed(csv_file: str) -> bool:
+    """A block is immutable once its rotation window (from the YYYY-MM-DD_HH.csv
+    name) has ended and the logger's last buffered rows have landed, or once
+    it has been untouched for CLOSED_CSV_AGE_SECONDS."""
+    now = time.time()
+    idle = now - os.path.getmtime(csv_file)
+    if idle > CLOSED_CSV_AGE_SECONDS:
+        return True
+    try:
+        block_start = datetime.strptime(os.path.basename(csv_file), '%Y-%m-%d_%H.csv').replace(tzinfo=UTC)
+    except ValueError:
+        return False
+    block_end = block_start.timestamp() + CLOSED_CSV_AGE_SECONDS
+    return now > block_end + CLOSED_CSV_GRACE_SECONDS and idle > CLOSED_CSV_GRACE_SECONDS
+
+def _file_signature(csv_file: str) -> List[int]:
+    st = os.stat(csv_file)
+    return [st.st_mtime_ns, st.st_size]
+
+def _load_state(asset_pair):
+    """Load the persisted summary of closed CSV blocks and the {name: signature}
+    of blocks it covers. Starts empty when the state is missing, was built for
+    another asset, or any covered block changed or disappeared."""
+    empty = (_empty_summary(), {})
+    path = os.path.join(DATA_FOLDER, MINUTE_STATE)
+    if not _HAS_PYARROW or not os.path.exists(path):
+        return empty
+    try:
+        table = pa_parquet.read_table(path)
+        meta = json.loads(table.schema.metadata[b'minute_state'])
+        if meta['version'] != _STATE_VERSION or meta['asset_pair'] != asset_pair:
+            return empty
+        for name, signature in meta['files'].items():
+            csv_path = os.path.join(DATA_FOLDER, name)
+            if not os.path.exists(csv_path) or _file_signature(csv_path) != signature:
+                print(f"♻️ {name} changed since it was summarized; rebuilding minute state")
+                return empty
+        summary = {
+            'partials': table.to_pandas() if table.num_rows else None,
+            'total_records': meta['total_records'],
+            'start': pd.Timestamp(meta['start']) if meta['start'] else None,
+            'end': pd.Timestamp(meta['end']) if meta['end'] else None,
+            'assets': None if meta['assets'] is None else set(meta['assets']),
+            'exchanges': None if meta['exchanges'] is None else set(meta['exchanges']),
+            'days': meta['days'],
+        }
+        return summary, meta['files']
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable minute state {path}: {e}")
+        return empty
+
+def _save_state(summary, files, asset_pair) -> None:
+    """Persist the summary of closed CSV blocks as one parquet file; the row
+    stats ride in its schema metadata so both are replaced atomically."""
+    if not _HAS_PYARROW:
+        return
+    path = os.path.join(DATA_FOLDER, MINUTE_STATE)
+    meta = {
+        'version': _STATE_VERSION,
+        'asset_pair': asset_pair,
+        'files': files,
+        'total_records': summary['total_records'],
+        'start': summary['start'].isoformat() if summary['start'] is not None else None,
+        'end': summary['end'].isoformat() if summary['end'] is not None else None,
+        'assets': None if summary['assets'] is None else sorted(summary['assets']),
+        'exchanges': None if summary['exchanges'] is None else sorted(summary['exchanges']),
+        'days': summary['days'],
+    }
+    try:
+        partials = summary['partials'] if summary['partials'] is not None else pd.DataFrame()
+        table = pa.Table.from_pandas(partials)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                               b'minute_state': json.dumps(meta)})
+        with _atomic_open(path, 'wb') as f:
+            pa_parquet.write_table(table, f, compression='zstd')
+    except Exception as e:
+        print(f"⚠️ Could not save minute state {path}: {e}")
+
+@contextmanager
+def _atomic_open(path: str, mode: str = 'wb'):
+    """Open path + '.tmp' for writing and rename it over path on success, so
+    readers (the chart server, GCS uploads) never see a half-written file."""
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _queue_gcs_upload(path: str) -> None:
+    """Upload a generated JSON file to GCS on the background pool, if enabled.
+    JSON is stored gzip-encoded (several times smaller on the wire)."""
+    try:
+        if gcs_utils and gcs_utils.is_gcs_enabled():
+            _pending_uploads.append(
+                _gcs_pool.submit(gcs_utils.upload_if_exists, path, path, content_type="application/json", gzip_encode=True)
+            )
+    except Exception as _:
+        pass
+
+def _wait_for_uploads() -> None:
+    """Block until every queued upload has finished."""
+    failed = 0
+    while _pending_uploads:
+        try:
+            if not _pending_uploads.pop().result():
+                failed += 1
+        except Exception:
+            failed += 1
+    if failed:
+        print(f"⚠️ {failed} GCS uploads failed")
+
+def _write_json(path: str, obj: Any, indent: bool = False) -> None:
+    """Write obj as JSON. Chart files are machine-read and written compact;
+    pass indent=True for the small human-read metadata/index files."""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        with _atomic_open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=option))
+    else:
+        with _atomic_open(path, 'w') as f:
+            if indent:
+                json.dump(obj, f, indent=2)
+            else:
+                json.dump(obj, f, separators=(',', ':'))
+
+CHART_CHUNK_ROWS = 10_000  # bars serialized per write when streaming chart JSON
+# Bar columns behind each chart record's price, bid, ask, spread, spread_pct, volume
+CHART_BAR_COLUMNS = ('price', 'bid', 'ask', 'spread', 'spread_avg_L5_pct', 'volume')
+
+def _write_chart_json(path: str, bars) -> int:
+    """Stream 1-minute bars to path as a JSON array of chart records
+    (time, price, bid, ask, spread, spread_pct, volume), CHART_CHUNK_ROWS at a
+    time, so the full list of record dicts is never held in memory.
+    Returns the number of records written."""
+    if orjson is not None:
+        dumps = orjson.dumps
+    else:
+        dumps = lambda records: json.dumps(records, separators=(',', ':')).encode()
+    with _atomic_open(path, 'wb') as f:
+        f.write(b'[')
+        for start in range(0, len(bars), CHART_CHUNK_ROWS):
+            chunk = bars.iloc[start:start + CHART_CHUNK_ROWS]
+            # Index is UTC (.values is naive UTC), so NumPy's vectorized ISO
+            # formatter plus the fixed offset matches Timestamp.isoformat()
+            times = np.datetime_as_string(chunk.index.values, unit='s')
+            columns = [np.char.add(times, '+00:00').tolist()]
+            columns += [chunk[col].tolist() for col in CHART_BAR_COLUMNS]
+            records = [
+                {'time': t, 'price': p, 'bid': b, 'ask': a, 'spread': s, 'spread_pct': sp, 'volume': v}
+                for t, p, b, a, s, sp, v in zip(*columns)
+            ]
+            if start:
+                f.write(b',')
+            f.write(dumps(records)[1:-1])
+        f.write(b']')
+    return len(bars)
+
+def _generate_historical_json(resampled, now: datetime, throttle: bool = False):
+    """Generate complete historical data JSON - RESAMPLED TO 1-MINUTE INTERVALS
+    (with throttle, skipped while the current file is younger than HISTORICAL_REFRESH_SECONDS)"""
     try:
-        # CRITICAL FIX: Resample to 1-minute intervals instead of using every second
-        df_copy = df.copy()
-        df_copy.set_index('timestamp', inplace=True)
-        
-        # Resample to 1-minute OHLC for price, last values for bid/ask, mean for spreads, sum for volume
-        resampled = df_copy.resample('1min').agg({
-            'price': 'last',           # Use last price in the minute
-            'bid': 'last',             # Use last bid in the minute  
-            'ask': 'last',             # Use last ask in the minute
-            'spread': 'mean',          # Average spread over the minute
-            'spread_avg_L5_pct': 'mean',  # Average L5 spread percentage
-            'volume': 'sum'            # Sum volume over the minute
-        }).dropna()
-        
-        # Convert to chart format
-        chart_data = []
-        for timestamp, row in resampled.iterrows():
-            chart_data.append({
-                "time": timestamp.isoformat(),
-                "price": float(row['price']),
-                "bid": float(row['bid']),
-                "ask": float(row['ask']),
-                "spread": float(row['spread']),
-                "spread_pct": float(row['spread_avg_L5_pct']),
-                "volume": float(row['volume'])
-            })
-        
         output_path = os.path.join(DATA_FOLDER, "historical.json")
+        try:
+            age = now.timestamp() - os.path.getmtime(output_path) if throttle else None
+        except OSError:
+            age = None
+        if age is not None and 0 <= age < HISTORICAL_REFRESH_SECONDS:
+            print(f"⏸️ historical.json is {age:.0f}s old, next rewrite after {HISTORICAL_REFRESH_SECONDS}s")
+            return
+        
+        bars = resampled.dropna()
+        
         # Build strictly from CSVs to avoid cross-contamination
-        with open(output_path, 'w') as f:
-            json.dump(chart_data, f, indent=2)
+        count = _write_chart_json(output_path, bars)
         
-        # Optional: upload to GCS
-        try:
-            if gcs_utils and gcs_utils.is_gcs_enabled():
-                gcs_utils.upload_if_exists(output_path, output_path, content_type="application/json")
-        except Exception as _:
-            pass
+        # Optional: upload to GCS (runs in the background)
+        _queue_gcs_upload(output_path)
         
-        print(f"📊 Generated historical.json: {len(chart_data)} records")
+        print(f"📊 Generated historical.json: {count} records")
         
     except Exception as e:
         print(f"❌ Error generating historical.json: {e}")
 
-def _generate_recent_json(df):
+def _generate_recent_json(resampled, now: datetime):
     """Generate last 24 hours of data JSON - RESAMPLED TO 1-MINUTE INTERVALS"""
     try:
-        # Get last 24 hours
-        now = datetime.now(UTC)
+        # Get last 24 hours: bars starting at or after the cutoff, so a partial
+        # first minute is never included
         cutoff_time = now - timedelta(hours=24)
         
-        recent_df = df[df['timestamp'] >= cutoff_time].copy()
-        
-        # CRITICAL FIX: Resample to 1-minute intervals instead of using every second
-        recent_df.set_index('timestamp', inplace=True)
-        
-        # Resample to 1-minute intervals
-        resampled = recent_df.resample('1min').agg({
-            'price': 'last',           # Use last price in the minute
-            'bid': 'last',             # Use last bid in the minute  
-            'ask': 'last',             # Use last ask in the minute
-            'spread': 'mean',          # Average spread over the minute
-            'spread_avg_L5_pct': 'mean',  # Average L5 spread percentage
-            'volume': 'sum'            # Sum volume over the minute
-        }).dropna()
-        
-        # Convert to chart format
-        chart_data = []
-        for timestamp, row in resampled.iterrows():
-            chart_data.append({
-                "time": timestamp.isoformat(),
-                "price": float(row['price']),
-                "bid": float(row['bid']),
-                "ask": float(row['ask']),
-                "spread": float(row['spread']),
-                "spread_pct": float(row['spread_avg_L5_pct']),
-                "volume": float(row['volume'])
-            })
+        # Bars are sorted by time: binary search instead of a full boolean mask
+        start = resampled.index.searchsorted(pd.Timestamp(cutoff_time), side='left')
+        bars = resampled.iloc[start:].dropna()
         
         output_path = os.path.join(DATA_FOLDER, "recent.json")
-        # Build strictly from CSVs, then enforce 24h window
-        merged = chart_data
-        # Enforce 24h window: filter by now-24h
-        now = datetime.now(UTC)
-        cutoff_time = now - timedelta(hours=24)
-        def _iso_to_dt(s):
-            try:
-                return datetime.fromisoformat(s.replace("Z", "+00:00"))
-            except Exception:
-                return now
-        merged = [r for r in merged if _iso_to_dt(r.get("time", "")) >= cutoff_time]
-        with open(output_path, 'w') as f:
-            json.dump(merged, f, indent=2)
-        
-        # Optional: upload to GCS
-        try:
-            if gcs_utils and gcs_utils.is_gcs_enabled():
-                gcs_utils.upload_if_exists(output_path, output_path, content_type="application/json")
-        except Exception as _:
-            pass
+        # Build strictly from CSVs
+        count = _write_chart_json(output_path, bars)
+        
+        # Optional: upload to GCS (runs in the background)
+        _queue_gcs_upload(output_path)
         
-        print(f"⚡ Generated recent.json: {len(chart_data)} records (last 24h)")
+        print(f"⚡ Generated recent.json: {count} records (last 24h)")
         
     except Exception as e:
         print(f"❌ Error generating recent.json: {e}")
 
-def _generate_daily_json_files(df):
-    """Generate daily JSON files"""
+def _daily_source_signatures(df) -> Dict[str, List[Any]]:
+    """Per UTC day of raw rows: [last timestamp, row count]. A day whose
+    signature is unchanged has nothing new to write."""
+    days = df.groupby(df['timestamp'].dt.floor('D'))['timestamp'].agg(['max', 'count'])
+    return {
+        str(day.date()): [last.isoformat(), int(count)]
+        for day, last, count in zip(days.index, days['max'], days['count'])
+    }
+
+def _generate_daily_json_files(resampled, signatures: Dict[str, List[Any]]):
+    """Generate daily JSON files (only for days whose source rows changed)"""
     try:
-        # Group by date
-        df['date'] = df['timestamp'].dt.date
-        
-        for date, group in df.groupby('date'):
-            # Resample to 1-minute intervals for daily files
-            group_resampled = group.set_index('timestamp').resample('1min').agg({
-                'price': 'last',
-                'bid': 'last', 
-                'ask': 'last',
-                'spread': 'mean',
-                'spread_avg_L5_pct': 'mean',
-                'volume': 'sum'
-            }).ffill().dropna()
+        manifest_path = os.path.join(DATA_FOLDER, DAILY_MANIFEST)
+        try:
+            manifest = _read_json(manifest_path)
+        except Exception:
+            manifest = {}
+        skipped = 0
+        
+        # Group the shared 1-minute bars by UTC day (integer binning on the index)
+        for day, day_bars in resampled.groupby(pd.Grouper(freq='D')):
+            if day_bars.empty:
+                continue
+            date_key = str(day.date())
+            filename = f"output_{date_key}.json"
+            output_path = os.path.join(DATA_FOLDER, filename)
+            signature = signatures.get(date_key)
+            if signature is not None and manifest.get(date_key) == signature and os.path.exists(output_path):
+                skipped += 1
+                continue
             
-            # Convert to chart format
-            chart_data = []
-            for timestamp, row in group_resampled.iterrows():
-                chart_data.append({
-                    "time": timestamp.isoformat(),
-                    "price": float(row['price']),
-                    "bid": float(row['bid']),
-                    "ask": float(row['ask']),
-                    "spread": float(row['spread']),
-                    "spread_pct": float(row['spread_avg_L5_pct']),
-                    "volume": float(row['volume'])
-                })
+            # Daily files forward-fill gaps, but only up to the day's last real bar
+            last_bar = day_bars['price'].last_valid_index()
+            if last_bar is None:
+                continue
+            group_resampled = day_bars.loc[:last_bar].ffill().dropna()
             
-            if chart_data:
-                filename = f"output_{date}.json"
-                output_path = os.path.join(DATA_FOLDER, filename)
+            if len(group_resampled):
                 # Build strictly from CSVs for daily files
-                with open(output_path, 'w') as f:
-                    json.dump(chart_data, f, indent=2)
+                count = _write_chart_json(output_path, group_resampled)
                 
-                # Optional: upload to GCS
-                try:
-                    if gcs_utils and gcs_utils.is_gcs_enabled():
-                        gcs_utils.upload_if_exists(output_path, output_path, content_type="application/json")
-                except Exception as _:
-                    pass
+                # Optional: upload to GCS (runs in the background)
+                _queue_gcs_upload(output_path)
                 
-                print(f"📅 Generated {filename}: {len(chart_data)} records")
+                print(f"📅 Generated {filename}: {count} records")
+                if signature is not None:
+                    manifest[date_key] = signature
+        
+        _write_json(manifest_path, manifest)
+        if skipped:
+            print(f"📅 Skipped {skipped} unchanged daily files")
         
     except Exception as e:
         print(f"❌ Error generating daily JSON files: {e}")
 
-def _generate_metadata(df, csv_files):
+def _generate_metadata(summary, csv_files, generated_at: str):
     """Generate metadata about the dataset"""
     try:
         metadata = {
-            "generated_at": datetime.now(UTC).isoformat(),
-            "total_records": len(df),
+            "generated_at": generated_at,
+            "total_records": summary['total_records'],
             "date_range": {
-                "start": df['timestamp'].min().isoformat(),
-                "end": df['timestamp'].max().isoformat()
+                "start": summary['start'].isoformat(),
+                "end": summary['end'].isoformat()
             },
             "csv_files_processed": len(csv_files),
-            "assets": sorted(list(set(df['asset'].dropna().unique()))) if 'asset' in df.columns else ([EXPECTED_ASSET_PAIR] if EXPECTED_ASSET_PAIR else []),
-            "exchanges": list(sorted(set(df['exchange'].dropna().unique()))) if 'exchange' in df.columns else [],
+            "assets": sorted(summary['assets']) if summary['assets'] is not None else ([EXPECTED_ASSET_PAIR] if EXPECTED_ASSET_PAIR else []),
+            "exchanges": sorted(summary['exchanges']) if summary['exchanges'] is not None else [],
             "data_points": {
                 "price": "Mid price between bid/ask",
                 "bid": "Best bid price",
@@ -311,33 +737,25 @@ def _generate_metadata(df, csv_files):
         }
         
         output_path = os.path.join(DATA_FOLDER, "metadata.json")
-        with open(output_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        _write_json(output_path, metadata, indent=True)
         
-        # Optional: upload to GCS
-        try:
-            if gcs_utils and gcs_utils.is_gcs_enabled():
-                gcs_utils.upload_if_exists(output_path, output_path, content_type="application/json")
-        except Exception as _:
-            pass
+        # Optional: upload to GCS (runs in the background)
+        _queue_gcs_upload(output_path)
         
         print(f"📋 Generated metadata.json")
         
     except Exception as e:
         print(f"❌ Error generating metadata: {e}")
 
-def _generate_index(csv_files):
+def _generate_index(csv_files, generated_at: str):
     """Generate index of available data files"""
     try:
-        # Get all JSON files that were generated
-        json_files = []
-        
-        # List daily output files
+        # List the daily output files actually on disk
         daily_pattern = os.path.join(DATA_FOLDER, "output_*.json")
         daily_files = [os.path.basename(f) for f in glob.glob(daily_pattern)]
         
         index_data = {
-            "generated_at": datetime.now(UTC).isoformat(),
+            "generated_at": generated_at,
             "csv_sources": [os.path.basename(f) for f in csv_files],
             "daily_files": sorted(daily_files),
             "chart_files": [
@@ -351,15 +769,10 @@ def _generate_index(csv_files):
         }
         
         output_path = os.path.join(DATA_FOLDER, "index.json")
-        with open(output_path, 'w') as f:
-            json.dump(index_data, f, indent=2)
+        _write_json(output_path, index_data, indent=True)
         
-        # Optional: upload to GCS
-        try:
-            if gcs_utils and gcs_utils.is_gcs_enabled():
-                gcs_utils.upload_if_exists(output_path, output_path, content_type="application/json")
-        except Exception as _:
-            pass
+        # Optional: upload to GCS (runs in the background)
+        _queue_gcs_upload(output_path)
         
         print(f"🗂️ Generated index.json")
         
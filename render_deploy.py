@@ -9,13 +9,12 @@ import sys
 import signal
 import threading
 import time
-from multiprocessing import Process
 
 # Add current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config import get_crypto_config, get_available_cryptos
-from multi_crypto_logger import create_app, CryptoLogger
+from multi_crypto_logger import create_app, CryptoLogger, install_shutdown_handlers
 
 
 def run_single_crypto(crypto_symbol, port=None):
@@ -31,6 +30,9 @@ def run_single_crypto(crypto_symbol, port=None):
         app = create_app(crypto_symbol)
         logger = app.crypto_logger
         
+        # Flush buffered CSV rows on SIGTERM (replaces the plain exit handler)
+        install_shutdown_handlers()
+        
         # Start logging thread
         logging_thread = threading.Thread(target=logger.log_data_continuous, daemon=True)
         logging_thread.start()
@@ -45,28 +47,16 @@ def run_single_crypto(crypto_symbol, port=None):
 
 
 def run_multiple_cryptos(crypto_symbols):
-    """Run multiple cryptocurrency loggers (for advanced deployment)"""
-    processes = []
+    """Run multiple cryptocurrency loggers in this one process (for advanced deployment).
+
+    All symbols share one Flask server on $PORT, routed as /<SYMBOL>/..., one
+    orderbook poll loop and one GCS client, instead of a full interpreter
+    (Flask + pandas + numpy) per symbol.
+    """
+    import multi_asset_server
     
-    try:
-        for i, symbol in enumerate(crypto_symbols):
-            config = get_crypto_config(symbol)
-            port = config['port']
-            
-            print(f"🚀 Starting {symbol} process on port {port}")
-            process = Process(target=run_single_crypto, args=(symbol, port))
-            process.start()
-            processes.append(process)
-            
-        # Wait for all processes
-        for process in processes:
-            process.join()
-            
-    except KeyboardInterrupt:
-        print("🛑 Shutting down all crypto loggers...")
-        for process in processes:
-            process.terminate()
-        sys.exit(0)
+    print(f"🚀 Starting {', '.join(crypto_symbols)} in one multi-asset server")
+    multi_asset_server.run_app(crypto_symbols)
 
 
 def signal_handler(sig, frame):